@@ -1,7 +1,9 @@
 import json
 import os
+import posixpath
 import re
 import subprocess
+from collections import defaultdict
 from concurrent.futures import ProcessPoolExecutor, as_completed
 
 def check_track_files(json_file_path, base_directory):
@@ -148,15 +150,23 @@ def check_hardcoded_hash(dir_path, file_name):
         {"original_name": f"{file_name}_right.wav", "hashed_name": hashed_names[1]}
     ]
 
+def check_hardcoded_rename(dir_path, file_name):
+    mappings = {
+        ("radio_02_pop", "circle_in_the_sand"): [
+            {'dir_path': "radio_01_class_rock", 'original_name': "circle_in_the_sand.wav", 'hashed_name': None}
+        ]
+    }
+
+    return mappings.get((dir_path, file_name), [])
+
 def check_hardcoded(dir_path, file_name):
     hardcoded_hash = check_hardcoded_hash(dir_path, file_name)
     if hardcoded_hash:
         return hardcoded_hash
 
-    if dir_path == "radio_02_pop" and file_name == "circle_in_the_sand":
-        return [
-            {'dir_path': "radio_01_class_rock", 'original_name': "circle_in_the_sand.wav", 'hashed_name': None}
-        ]
+    hardcoded_rename = check_hardcoded_rename(dir_path, file_name)
+    if hardcoded_rename:
+        return hardcoded_rename
     
     if dir_path == 'radio_02_pop/intro':
         match = re.match(r'^tell_to_my_heart_(\d{2})$', file_name)
@@ -278,6 +288,209 @@ def rockstar_audio_name_hash(name):
     result = f"0x{hash_value:08X}"
     return result
 
+HASHED_NAME_PATTERN = re.compile(r'^0x[0-9a-f]{8}$', re.IGNORECASE)
+
+def normalize_candidate_name(name):
+    """
+    Normalizes a file or track name for fuzzy matching: lowercases it and drops the _left/_right channel suffix.
+
+    :param name: File or track name without extension
+    :return: Normalized name
+    """
+    return re.sub(r'_(left|right)$', '', name.lower())
+
+def name_trigrams(name):
+    """
+    Splits a normalized name into character trigrams, padded so that word edges count as well.
+
+    :param name: Normalized name
+    :return: Set of trigrams
+    """
+    padded = f"  {name} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+def build_filename_index(base_directory):
+    """
+    Walks the base directory once and builds a trigram index over every WAV file name in it.
+    Files sharing a normalized name in one directory (e.g. _left/_right pairs) form a single candidate.
+    Every folder holding WAV files is a candidate too, because sources may sit in a folder named after the track.
+    Hashed 0x names cannot be matched by text, so they are only collected per directory for joaat checks.
+
+    :param base_directory: Base directory for searching track files
+    :return: Dictionary with candidates, trigram postings keyed by (station, trigram) and hashed names per directory
+    """
+    candidates = []
+    candidate_ids = {}
+    postings = defaultdict(list)
+    hashed_names = defaultdict(dict)
+
+    def add_candidate(directory, name, file_path):
+        key = (directory, normalize_candidate_name(name))
+        candidate_id = candidate_ids.get(key)
+        if candidate_id is None:
+            candidate_id = len(candidates)
+            candidate_ids[key] = candidate_id
+            trigrams = name_trigrams(key[1])
+            candidates.append({
+                'directory': directory,
+                'name': key[1],
+                'trigram_count': len(trigrams),
+                'files': []
+            })
+            station = directory.split('/')[0]
+            for trigram in trigrams:
+                postings[(station, trigram)].append(candidate_id)
+        candidates[candidate_id]['files'].append(file_path)
+
+    for root, dirs, files in os.walk(base_directory):
+        dirs.sort()
+        rel_dir = os.path.relpath(root, base_directory).replace(os.sep, '/')
+        if rel_dir == '.':
+            continue
+        parent_dir, folder_name = posixpath.split(rel_dir)
+
+        for file_name in sorted(files):
+            stem, ext = os.path.splitext(file_name)
+            if ext.lower() != '.wav':
+                continue
+            file_path = posixpath.join(rel_dir, file_name)
+            if HASHED_NAME_PATTERN.match(stem):
+                hashed_names[rel_dir][f"0x{stem[2:].upper()}"] = file_name
+            else:
+                add_candidate(rel_dir, stem, file_path)
+            if parent_dir:
+                add_candidate(parent_dir, folder_name, file_path)
+
+    return {'candidates': candidates, 'postings': postings, 'hashed_names': hashed_names}
+
+def rank_source_candidates(path, index, limit=3, min_score=0.4):
+    """
+    Ranks indexed candidates from the same station directory by trigram similarity (Dice coefficient) to the track name.
+
+    :param path: Track path from the JSON
+    :param index: Index returned by build_filename_index
+    :param limit: Maximum number of candidates to return
+    :param min_score: Minimum similarity for a candidate to be reported
+    :return: List of (score, candidate) tuples, best first
+    """
+    dir_path, file_name = posixpath.split(path)
+    station = dir_path.split('/')[0]
+    query = name_trigrams(normalize_candidate_name(file_name))
+
+    shared = defaultdict(int)
+    for trigram in query:
+        for candidate_id in index['postings'].get((station, trigram), ()):
+            shared[candidate_id] += 1
+
+    scored = []
+    for candidate_id, count in shared.items():
+        candidate = index['candidates'][candidate_id]
+        score = 2 * count / (len(query) + candidate['trigram_count'])
+        if score >= min_score:
+            scored.append((score, candidate))
+
+    scored.sort(key=lambda item: (-item[0], item[1]['directory'], item[1]['name']))
+
+    # A folder named after the track and the files inside it resolve to the same sources, keep only the first
+    ranked = []
+    seen_files = set()
+    for score, candidate in scored:
+        files = frozenset(candidate['files'])
+        if files in seen_files:
+            continue
+        seen_files.add(files)
+        ranked.append((score, candidate))
+        if len(ranked) == limit:
+            break
+    return ranked
+
+def find_hashed_sources(name, directories, index):
+    """
+    Looks for 0x files whose joaat hash matches the name or its _left/_right variants.
+
+    :param name: Candidate name without extension
+    :param directories: Relative directories to look in
+    :param index: Index returned by build_filename_index
+    :return: List of (original name, relative path of the hashed file) tuples
+    """
+    matches = []
+    for variant in (name, f"{name}_left", f"{name}_right"):
+        hashed_name = rockstar_audio_name_hash(variant)
+        for directory in directories:
+            file_name = index['hashed_names'].get(directory, {}).get(hashed_name)
+            if file_name:
+                matches.append((f"{variant}.wav", posixpath.join(directory, file_name)))
+                break
+    return matches
+
+def format_resolver_rule(path, score, candidate, index):
+    """
+    Formats a candidate as an entry for the mapping table in check_hardcoded_rename.
+    File names are made relative to the track directory, which is where get_src_audio_filenames looks first.
+
+    :param path: Track path from the JSON
+    :param score: Similarity score of the candidate
+    :param candidate: Candidate from the index
+    :param index: Index returned by build_filename_index
+    :return: Mapping table line
+    """
+    dir_path, file_name = posixpath.split(path)
+    directories = list(dict.fromkeys([
+        candidate['directory'],
+        posixpath.join(candidate['directory'], candidate['name']),
+        dir_path,
+        path
+    ]))
+    hashed_sources = find_hashed_sources(candidate['name'], directories, index)
+
+    if hashed_sources:
+        file_infos = [
+            {'original_name': original_name, 'hashed_name': posixpath.relpath(hashed_path, dir_path)}
+            for original_name, hashed_path in hashed_sources
+        ]
+        note = f"score {score:.2f}, joaat verified"
+    else:
+        file_infos = []
+        for file_path in candidate['files']:
+            relative_path = posixpath.relpath(file_path, dir_path)
+            if HASHED_NAME_PATTERN.match(os.path.splitext(os.path.basename(file_path))[0]):
+                file_infos.append({'original_name': os.path.basename(file_path), 'hashed_name': relative_path})
+            else:
+                file_infos.append({'original_name': relative_path, 'hashed_name': None})
+        note = f"score {score:.2f}"
+
+    rule = f'("{dir_path}", "{file_name}"): {file_infos},  # {note}'
+    if len(file_infos) > 2:
+        return f"# {rule}, {len(file_infos)} files"
+    return rule
+
+def print_missing_track_candidates(results, base_directory, limit=3):
+    """
+    Prints likely source files for tracks that have none, as rules for check_hardcoded_rename.
+    The best candidate of each track is printed as a rule, the rest are commented out.
+
+    :param results: List of dictionaries with track information and found file paths
+    :param base_directory: Base directory for searching track files
+    :param limit: Maximum number of candidates per track
+    """
+    missing = [result for result in results if not result['src_audio']]
+    if not missing:
+        return
+
+    index = build_filename_index(base_directory)
+    print(f"Candidate rules for {len(missing)} missing tracks:")
+    for result in missing:
+        path = result['original_path']
+        candidates = rank_source_candidates(path, index, limit)
+        if not candidates:
+            print(f"    # {path}: no candidates")
+            continue
+        for position, (score, candidate) in enumerate(candidates):
+            rule = format_resolver_rule(path, score, candidate, index)
+            if position > 0 and not rule.startswith('#'):
+                rule = f"# {rule}"
+            print(f"    {rule}")
+
 def run_ffmpeg_conversion(input_files, output_file):
     """
     Runs FFmpeg to convert one or two input WAV files to M4A format.
@@ -439,6 +652,9 @@ if __name__ == "__main__":
     # Print detailed information
     print_detailed_results(results)
 
+    # Suggest sources for tracks with no files found
+    print_missing_track_candidates(results, base_dir)
+
     # Convert found files to M4A in parallel
     convert_to_m4a(results, output_dir)
     
\ No newline at end of file
@@ -0,0 +1,226 @@
+import json
+import os
+import shutil
+import struct
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+TEXTURES_DIR = 'textures'
+MANIFEST_NAME = 'manifest.json'
+LOCAL_HEADER_SIZE = 30
+
+def list_stations(converted_directory):
+    """
+    Lists station directories in the converted output, skipping the shared textures directory.
+
+    :param converted_directory: Directory with converted M4A files
+    :return: Sorted list of station directory names
+    """
+    return sorted(
+        name for name in os.listdir(converted_directory)
+        if name != TEXTURES_DIR and os.path.isdir(os.path.join(converted_directory, name))
+    )
+
+def station_textures(station):
+    """
+    Returns the logos of the radio stations whose tracks live in a directory.
+    Base game directories share their name with the logo; DLC directories are mapped
+    after the station sections of files.txt, and one directory may feed several stations.
+
+    :param station: Station directory name
+    :return: List of texture names without extension
+    """
+    mappings = {
+        "dlc_radio_19_user": ["radio_19_user"],
+        "dlc_thelab": ["radio_20_thelab"],
+        "dlc_christmas2017": ["radio_21_dlc_xm17"],
+        "dlc_battle_music": ["radio_22_dlc_battle_mix1_radio"],
+        "dlc_heist3": ["radio_23_dlc_xm19_radio"],
+        "dlc_hei4": ["radio_34_dlc_hei4_kult"],
+        "dlc_24-1": ["radio_34_dlc_hei4_kult"],
+        "dlc_hei4_music": ["radio_27_dlc_prhei4", "radio_34_dlc_hei4_kult", "radio_35_dlc_hei4_mlr"],
+        "dlc_security_music": ["radio_37_motomami"]
+    }
+
+    return mappings.get(station, [station])
+
+def list_station_files(converted_directory, station):
+    """
+    Collects the files of a station together with its size and modification time.
+    The station textures (textures/<logo>.png, see station_textures) are included when present.
+
+    :param converted_directory: Directory with converted M4A files
+    :param station: Station directory name
+    :return: Dictionary mapping archive names to [size, mtime_ns]
+    """
+    files = {}
+    station_directory = os.path.join(converted_directory, station)
+    for root, dirs, file_names in os.walk(station_directory):
+        dirs.sort()
+        for file_name in sorted(file_names):
+            if file_name.startswith('.'):
+                continue
+            file_path = os.path.join(root, file_name)
+            arcname = os.path.relpath(file_path, converted_directory).replace(os.sep, '/')
+            stat = os.stat(file_path)
+            files[arcname] = [stat.st_size, stat.st_mtime_ns]
+
+    for texture in station_textures(station):
+        texture_path = os.path.join(converted_directory, TEXTURES_DIR, f"{texture}.png")
+        if os.path.isfile(texture_path):
+            stat = os.stat(texture_path)
+            files[f"{TEXTURES_DIR}/{texture}.png"] = [stat.st_size, stat.st_mtime_ns]
+
+    return files
+
+def read_data_offsets(archive_path, infos):
+    """
+    Reads the local file headers of a finished archive to find where each member's data starts.
+
+    :param archive_path: Path to the ZIP archive
+    :param infos: List of ZipInfo objects of the archive
+    :return: Dictionary mapping archive names to data offsets
+    """
+    offsets = {}
+    with open(archive_path, 'rb') as f:
+        for info in infos:
+            f.seek(info.header_offset)
+            header = f.read(LOCAL_HEADER_SIZE)
+            name_length, extra_length = struct.unpack('<2H', header[26:30])
+            offsets[info.filename] = info.header_offset + LOCAL_HEADER_SIZE + name_length + extra_length
+    return offsets
+
+def build_station_bundle(converted_directory, bundle_directory, station, files):
+    """
+    Writes one stored (uncompressed) ZIP archive for a station and its offset/length index.
+    Files are streamed straight from the converted output into the archive.
+    The archive is written under a temporary name and renamed once complete.
+    Because members are stored, a client can fetch a single track with an HTTP range request.
+
+    :param converted_directory: Directory with converted M4A files
+    :param bundle_directory: Directory where the archives and indexes are saved
+    :param station: Station directory name
+    :param files: Dictionary mapping archive names to [size, mtime_ns], as returned by list_station_files
+    :return: Station name
+    """
+    archive_name = f"{station}.zip"
+    archive_path = os.path.join(bundle_directory, archive_name)
+    partial_path = archive_path + '.part'
+
+    with zipfile.ZipFile(partial_path, 'w', compression=zipfile.ZIP_STORED) as archive:
+        for arcname in files:
+            file_path = os.path.join(converted_directory, *arcname.split('/'))
+            info = zipfile.ZipInfo.from_file(file_path, arcname, strict_timestamps=False)
+            info.compress_type = zipfile.ZIP_STORED
+            with open(file_path, 'rb') as src, archive.open(info, 'w') as dst:
+                shutil.copyfileobj(src, dst, 1024 * 1024)
+        infos = archive.infolist()
+
+    offsets = read_data_offsets(partial_path, infos)
+    index = {
+        'archive': archive_name,
+        'files': {
+            info.filename: {'offset': offsets[info.filename], 'length': info.file_size}
+            for info in infos
+        }
+    }
+
+    os.replace(partial_path, archive_path)
+    with open(os.path.join(bundle_directory, f"{station}.json"), 'w', encoding='utf-8') as f:
+        json.dump(index, f, indent=2, ensure_ascii=False)
+
+    return station
+
+def report_unpacked_textures(converted_directory, packaged_files):
+    """
+    Prints every textures/radio_*.png that no station bundle includes.
+
+    :param converted_directory: Directory with converted M4A files
+    :param packaged_files: Set of archive names included in any bundle
+    """
+    textures_directory = os.path.join(converted_directory, TEXTURES_DIR)
+    if not os.path.isdir(textures_directory):
+        return
+    for file_name in sorted(os.listdir(textures_directory)):
+        texture_name = f"{TEXTURES_DIR}/{file_name}"
+        if file_name.startswith('radio_') and file_name.endswith('.png') and texture_name not in packaged_files:
+            print(f"Texture {texture_name} is not included in any bundle")
+
+def load_manifest(bundle_directory):
+    """
+    Loads the bundle manifest from the previous run.
+
+    :param bundle_directory: Directory where the archives and indexes are saved
+    :return: Dictionary mapping station names to their packaged files, empty if there is no manifest
+    """
+    manifest_path = os.path.join(bundle_directory, MANIFEST_NAME)
+    if not os.path.exists(manifest_path):
+        return {}
+    with open(manifest_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def package_stations(converted_directory, bundle_directory, max_workers=os.cpu_count()):
+    """
+    Packages every station into its own archive in parallel.
+    Stations whose files match the manifest of the previous run and whose archive and index still exist are skipped.
+    The manifest is written even if packaging is interrupted, listing only the stations that are up to date.
+
+    :param converted_directory: Directory with converted M4A files
+    :param bundle_directory: Directory where the archives, indexes and manifest are saved
+    :param max_workers: Maximum number of parallel packaging processes
+    """
+    os.makedirs(bundle_directory, exist_ok=True)
+    manifest = load_manifest(bundle_directory)
+
+    stations = list_stations(converted_directory)
+    tasks = {}
+    new_manifest = {}
+    packaged_files = set()
+    for station in stations:
+        files = list_station_files(converted_directory, station)
+        packaged_files.update(files)
+        bundle_exists = all(
+            os.path.exists(os.path.join(bundle_directory, file_name))
+            for file_name in (f"{station}.zip", f"{station}.json")
+        )
+        if bundle_exists and manifest.get(station) == {'files': files}:
+            print(f"Skipping station {station} (unchanged)")
+            new_manifest[station] = {'files': files}
+            continue
+        tasks[station] = files
+
+    report_unpacked_textures(converted_directory, packaged_files)
+
+    try:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            future_to_station = {
+                executor.submit(build_station_bundle, converted_directory, bundle_directory, station, files): station
+                for station, files in tasks.items()
+            }
+
+            for future in as_completed(future_to_station):
+                station = future_to_station[future]
+                try:
+                    future.result()
+                    new_manifest[station] = {'files': tasks[station]}
+                    print(f"Successfully packaged station {station} ({len(tasks[station])} files)")
+                except (OSError, ValueError) as e:
+                    # The station stays out of the manifest, so the next run rebuilds it
+                    print(f"Failed to package station {station}: {e}")
+
+        for station in sorted(set(manifest) - set(stations)):
+            for file_name in (f"{station}.zip", f"{station}.json"):
+                file_path = os.path.join(bundle_directory, file_name)
+                if os.path.exists(file_path):
+                    os.remove(file_path)
+            print(f"Removed bundle for station {station}")
+    finally:
+        with open(os.path.join(bundle_directory, MANIFEST_NAME), 'w', encoding='utf-8') as f:
+            json.dump(new_manifest, f, indent=2, ensure_ascii=False)
+
+# Example usage
+if __name__ == "__main__":
+    converted_dir = "converted_m4a"
+    bundle_dir = "bundles"
+
+    package_stations(converted_dir, bundle_dir)